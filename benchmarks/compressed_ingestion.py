@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""Compares decoding compressed xemu logs in a pipeline against decompressing to disk and then decoding.
+
+The given uncompressed log (e.g., one produced by synthetic_trace.py) is compressed with each supported format before
+timing begins.
+"""
+
+# ruff: noqa: T201 `print` found
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from generated_module import load_generated_module
+
+_FORMATS = {
+    "gz": gzip.open,
+    "xz": lzma.open,
+    "bz2": bz2.open,
+}
+
+
+def _decode(nv2a, reader) -> int:
+    count = 0
+    for decoded in nv2a.decode_batch(reader.commands()):
+        count += decoded is not None
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", help="Path to the generated Python module")
+    parser.add_argument("log", help="Uncompressed xemu log to benchmark with")
+    parser.add_argument("--formats", default="gz,xz,bz2", help="Comma separated list of compression formats")
+    args = parser.parse_args()
+
+    nv2a = load_generated_module(args.module)
+    log_size = os.path.getsize(args.log)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{'format':>6} {'mode':>24} {'seconds':>8} {'MB/s':>8}")
+        for fmt in args.formats.split(","):
+            compressed_path = os.path.join(tmpdir, f"log.{fmt}")
+            with open(args.log, "rb") as infile, _FORMATS[fmt](compressed_path, "wb") as outfile:
+                shutil.copyfileobj(infile, outfile)
+
+            start = time.perf_counter()
+            decompressed_path = os.path.join(tmpdir, "log.txt")
+            with _FORMATS[fmt](compressed_path, "rb") as infile, open(decompressed_path, "wb") as outfile:
+                shutil.copyfileobj(infile, outfile, 1 << 20)
+            _decode(nv2a, nv2a.LogFileReader(decompressed_path))
+            sequential = time.perf_counter() - start
+            os.unlink(decompressed_path)
+
+            start = time.perf_counter()
+            reader = nv2a.LogFileReader(compressed_path)
+            _decode(nv2a, reader)
+            pipelined = time.perf_counter() - start
+
+            megabytes = log_size / (1 << 20)
+            print(f"{fmt:>6} {'decompress then decode':>24} {sequential:8.2f} {megabytes / sequential:8.1f}")
+            print(f"{fmt:>6} {'pipelined':>24} {pipelined:8.2f} {megabytes / pipelined:8.1f}")
+            print(f"{fmt:>6} {'reader throughput':>24} {reader.elapsed:8.2f} {reader.throughput / (1 << 20):8.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
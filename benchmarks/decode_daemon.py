@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Compares the latency of decoding via a long running DecodeServer against importing the generated module per call.
+
+Three cases are measured for a small batch of commands:
+ - a new interpreter that imports the generated module and decodes directly
+ - a new interpreter running the thin decode_client against the server
+ - repeated requests over a single, reused client connection
+"""
+
+# ruff: noqa: T201 `print` found
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from generated_module import load_generated_module
+
+_SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(_SRC_DIR))
+
+from nv2a_define_collator.decode_client import DecodeClient  # noqa: E402
+
+_DIRECT_SCRIPT = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("nv2a_generated", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+spec.loader.exec_module(module)
+for command in module.iter_log_commands(sys.stdin):
+    print(module.get_command_info(*command).get_pretty_string())
+"""
+
+
+def _time_subprocess(args: list[str], text: str, repeats: int) -> float:
+    env = dict(os.environ, PYTHONPATH=str(_SRC_DIR))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        subprocess.run(args, input=text, capture_output=True, text=True, check=True, env=env)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", help="Path to the generated Python module")
+    parser.add_argument("log", help="xemu log to take commands from")
+    parser.add_argument("--lines", type=int, default=16, help="Number of log lines decoded per call")
+    parser.add_argument("--process-repeats", type=int, default=10, help="Number of process launches to time")
+    parser.add_argument("--request-repeats", type=int, default=5000, help="Number of socket requests to time")
+    args = parser.parse_args()
+
+    with open(args.log) as infile:
+        text = "".join(infile.readline() for _ in range(args.lines))
+
+    nv2a = load_generated_module(args.module)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "decode.sock")
+        with nv2a.DecodeServer(socket_path) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+
+            direct = _time_subprocess([sys.executable, "-c", _DIRECT_SCRIPT, args.module], text, args.process_repeats)
+            thin_client = _time_subprocess(
+                [sys.executable, "-m", "nv2a_define_collator.decode_client", "--socket", socket_path, "decode-log"],
+                text,
+                args.process_repeats,
+            )
+
+            with DecodeClient(socket_path) as client:
+                client.decode_log(text)
+                start = time.perf_counter()
+                for _ in range(args.request_repeats):
+                    client.decode_log(text)
+                reused = (time.perf_counter() - start) / args.request_repeats
+
+            server.shutdown()
+            thread.join()
+
+    print(f"{'mode':>32} {'ms/call':>10}")
+    print(f"{'import generated module':>32} {direct * 1000:10.3f}")
+    print(f"{'thin client process':>32} {thin_client * 1000:10.3f}")
+    print(f"{'reused connection':>32} {reused * 1000:10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""Imports generated nv2a constants modules for the benchmark scripts."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+
+def load_generated_module(path: str) -> ModuleType:
+    """Imports the generated module at `path` as "nv2a_generated"."""
+    spec = importlib.util.spec_from_file_location("nv2a_generated", path)
+    if spec is None or spec.loader is None:
+        msg = f"Failed to load generated module {path}"
+        raise ImportError(msg)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
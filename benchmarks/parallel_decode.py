@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+"""Measures how decoding throughput of a generated nv2a constants module scales across threads.
+
+On free-threaded builds (e.g., python3.13t) throughput should scale with the thread count. On standard builds the
+default ParallelDecoder decodes on the calling thread and should match the serial baseline.
+"""
+
+# ruff: noqa: T201 `print` found
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from generated_module import load_generated_module
+
+
+def _best_time(func, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", help="Path to the generated Python module")
+    parser.add_argument("--commands", type=int, default=1_000_000, help="Number of commands to decode")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma separated list of thread counts to measure")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of timed runs per configuration")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    nv2a = load_generated_module(args.module)
+
+    rng = random.Random(args.seed)
+    keys = list(nv2a.PROCESSORS)
+    commands = [nv2a.RawCommand(0, *rng.choice(keys), rng.getrandbits(32)) for _ in range(args.commands)]
+    log_lines = [
+        f"nv2a_pgraph_method {channel}: 0x{nv_class:x} -> 0x{nv_op:04x} 0x{nv_param:x}\n"
+        for channel, nv_class, nv_op, nv_param in commands
+    ]
+    log_chunks = ["".join(log_lines[start : start + 16384]) for start in range(0, len(log_lines), 16384)]
+
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {nv2a._gil_enabled()}")
+    print(f"Default workers: {nv2a.default_decode_workers()}")
+
+    serial = _best_time(lambda: nv2a.decode_batch(commands), args.repeats)
+    serial_log = _best_time(lambda: [nv2a.decode_log_chunk(chunk) for chunk in log_chunks], args.repeats)
+    print(f"{'threads':>8} {'decode s':>10} {'Mcmd/s':>8} {'speedup':>8} {'log s':>10} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:10.3f} {args.commands / serial / 1e6:8.2f} {1.0:8.2f} {serial_log:10.3f} {1.0:8.2f}")
+
+    for threads in (int(value) for value in args.threads.split(",")):
+        with nv2a.ParallelDecoder(threads) as decoder:
+            elapsed = _best_time(lambda decoder=decoder: decoder.decode(commands), args.repeats)
+            elapsed_log = _best_time(
+                lambda decoder=decoder: list(decoder.decode_log_chunks(log_chunks)),
+                args.repeats,
+            )
+        print(
+            f"{threads:>8} {elapsed:10.3f} {args.commands / elapsed / 1e6:8.2f} {serial / elapsed:8.2f} "
+            f"{elapsed_log:10.3f} {serial_log / elapsed_log:8.2f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
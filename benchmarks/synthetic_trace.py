@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+
+"""Generates synthetic PGRAPH traces for load testing and benchmarking.
+
+Traces are built from the method tables of a generated nv2a constants module and are fully determined by the seed and
+configuration, allowing benchmark inputs to be reproduced without sharing real captures. Output is streamed, so
+arbitrarily large traces may be produced in constant memory.
+"""
+
+# ruff: noqa: T201 `print` found
+
+from __future__ import annotations
+
+import argparse
+import random
+import struct
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from generated_module import load_generated_module
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+_FLOAT = struct.Struct("<f")
+
+# Method name prefixes that are emitted as part of a specific group rather than as general state.
+_COMBINER_PREFIX = "NV097_SET_COMBINER_"
+_NON_STATE_PREFIXES = (
+    _COMBINER_PREFIX,
+    "NV097_SET_BEGIN_END",
+    "NV097_SET_OBJECT",
+    "NV097_SET_SEMAPHORE",
+    "NV097_SET_TRANSFORM_CONSTANT",
+    "NV097_SET_TRANSFORM_DATA",
+    "NV097_SET_TRANSFORM_PROGRAM",
+    "NV097_SET_VERTEX",
+    "NV097_SET_NORMAL",
+    "NV097_SET_DIFFUSE_COLOR",
+    "NV097_SET_TEXCOORD",
+)
+
+# Vertex attribute slots used for inline vertex data and their NV097_SET_VERTEX_DATA_ARRAY_FORMAT (type, size).
+_ATTRIBUTE_POSITION = 0
+_ATTRIBUTE_DIFFUSE = 3
+_ATTRIBUTE_TEXCOORD0 = 9
+_TYPE_UB_D3D = 0
+_TYPE_FLOAT = 2
+_NUM_ATTRIBUTES = 16
+
+# NV097_SET_BEGIN_END primitive modes.
+_PRIMITIVE_MODES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+
+@dataclass
+class TraceConfig:
+    """Controls the shape of a synthetic trace."""
+
+    """RNG seed. Identical seeds and configurations produce identical traces."""
+    seed: int = 0
+
+    frames: int = 60
+    draws_per_frame: int = 200
+
+    """Average number of general state writes (e.g., blend, depth, texture setup) before each draw."""
+    state_writes_per_draw: int = 12
+
+    """Probability that a draw is preceded by new transformation matrices."""
+    matrix_rate: float = 0.5
+
+    """Probability that a draw is preceded by a new register combiner program."""
+    combiner_rate: float = 0.1
+
+    """Inclusive range of the number of vertices sent inline with each draw."""
+    min_vertices: int = 3
+    max_vertices: int = 300
+
+    """Number of distinct values each state method may take. Smaller pools produce more redundant writes."""
+    values_per_method: int = 4
+
+    channel: int = 0
+
+
+def _is_matrix(name: str) -> bool:
+    return name.partition("@")[0].endswith("_MATRIX")
+
+
+class SyntheticTraceGenerator:
+    """Produces a stream of RawCommand method writes resembling a game's rendering loop."""
+
+    def __init__(self, nv2a, config: TraceConfig):
+        self.nv2a = nv2a
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._kelvin = 0x97
+
+        keys_by_name = {name: key for key, name in nv2a._NAME_MAP.items() if key[0] == self._kelvin}
+
+        # Group expanded array elements (e.g., the 16 entries of a matrix) so they can be written together.
+        groups: dict[str, list[tuple[int, int]]] = {}
+        for name, key in keys_by_name.items():
+            groups.setdefault(name.partition("[")[0], []).append(key)
+        for keys in groups.values():
+            keys.sort()
+
+        self._matrices = [keys for name, keys in sorted(groups.items()) if _is_matrix(name)]
+        self._combiner = [
+            key for name, keys in sorted(groups.items()) if name.startswith(_COMBINER_PREFIX) for key in keys
+        ]
+        self._state = sorted(
+            key
+            for name, keys in groups.items()
+            if name.startswith("NV097_SET_") and not name.startswith(_NON_STATE_PREFIXES) and not _is_matrix(name)
+            for key in keys
+        )
+        self._surface = [key for key in self._state if "SURFACE" in nv2a._NAME_MAP[key]]
+
+        self._value_pools: dict[tuple[int, int], list[int]] = {}
+
+    def _make_sampler(self, key: tuple[int, int]) -> Callable[[], int]:
+        """Returns a function producing plausible parameters for the given method, based on its decoder."""
+        rng = self._rng
+        nv2a = self.nv2a
+        processor = nv2a.PROCESSORS.get(key)
+        param_type: Any = getattr(getattr(processor, "decode", None), "__self__", None)
+
+        if param_type is None:
+            return lambda: rng.getrandbits(32)
+
+        if issubclass(param_type, nv2a.FloatParam):
+            return lambda: int.from_bytes(_FLOAT.pack(rng.uniform(-1.0, 1.0)), "little")
+
+        if issubclass(param_type, nv2a.BooleanParam):
+            return lambda: rng.randrange(2)
+
+        values = getattr(param_type, "VALUES", None)
+        if values:
+            choices = list(values)
+            return lambda: rng.choice(choices)
+
+        layout = getattr(param_type, "LAYOUT", None)
+        if layout:
+            field_choices = []
+            for field in layout:
+                known_values = param_type.FIELD_VALUES.get(field.name)
+                if known_values:
+                    field_choices.append((field.shift, list(known_values)))
+                else:
+                    field_choices.append((field.shift, [0, 1, field.mask, rng.randrange(field.mask + 1)]))
+
+            def _sample_bitfields():
+                ret = 0
+                for shift, choices in field_choices:
+                    ret |= rng.choice(choices) << shift
+                return ret & 0xFFFFFFFF
+
+            return _sample_bitfields
+
+        return lambda: rng.getrandbits(32)
+
+    def _pooled_value(self, key: tuple[int, int]) -> int:
+        pool = self._value_pools.get(key)
+        if pool is None:
+            sampler = self._make_sampler(key)
+            pool = [sampler() for _ in range(max(1, self.config.values_per_method))]
+            self._value_pools[key] = pool
+        return self._rng.choice(pool)
+
+    def _write(self, key: tuple[int, int], nv_param: int):
+        return self.nv2a.RawCommand(self.config.channel, key[0], key[1], nv_param)
+
+    def _frame_setup(self) -> Iterator[Any]:
+        for key in self._surface:
+            yield self._write(key, self._pooled_value(key))
+        yield self._write((self._kelvin, self.nv2a.NV097_CLEAR_SURFACE), 0xF3)
+
+    def _draw(self) -> Iterator[Any]:
+        rng = self._rng
+        config = self.config
+
+        if self._state:
+            for _ in range(rng.randint(0, config.state_writes_per_draw * 2)):
+                key = rng.choice(self._state)
+                yield self._write(key, self._pooled_value(key))
+
+        if self._matrices and rng.random() < config.matrix_rate:
+            for keys in rng.sample(self._matrices, min(2, len(self._matrices))):
+                for key in keys:
+                    yield self._write(key, int.from_bytes(_FLOAT.pack(rng.uniform(-2.0, 2.0)), "little"))
+
+        if self._combiner and rng.random() < config.combiner_rate:
+            for key in self._combiner:
+                yield self._write(key, self._pooled_value(key))
+
+        yield from self._inline_draw()
+
+    def _inline_draw(self) -> Iterator[Any]:
+        rng = self._rng
+        nv2a = self.nv2a
+
+        position_size = rng.choice((3, 4))
+        has_diffuse = rng.random() < 0.5
+        has_texcoord = rng.random() < 0.5
+        words_per_vertex = position_size + has_diffuse + 2 * has_texcoord
+        stride = words_per_vertex * 4
+
+        formats = {_ATTRIBUTE_POSITION: (_TYPE_FLOAT, position_size)}
+        if has_diffuse:
+            formats[_ATTRIBUTE_DIFFUSE] = (_TYPE_UB_D3D, 4)
+        if has_texcoord:
+            formats[_ATTRIBUTE_TEXCOORD0] = (_TYPE_FLOAT, 2)
+
+        for slot in range(_NUM_ATTRIBUTES):
+            attribute_type, size = formats.get(slot, (_TYPE_FLOAT, 0))
+            yield self._write(
+                (self._kelvin, nv2a.NV097_SET_VERTEX_DATA_ARRAY_FORMAT + slot * 4),
+                attribute_type | (size << 4) | ((stride if size else 0) << 8),
+            )
+
+        begin_end = (self._kelvin, nv2a.NV097_SET_BEGIN_END)
+        inline_array = (self._kelvin, nv2a.NV097_INLINE_ARRAY)
+        yield self._write(begin_end, rng.choice(_PRIMITIVE_MODES))
+        for _ in range(rng.randint(self.config.min_vertices, self.config.max_vertices)):
+            for _ in range(position_size):
+                yield self._write(inline_array, int.from_bytes(_FLOAT.pack(rng.uniform(-100.0, 100.0)), "little"))
+            if has_diffuse:
+                yield self._write(inline_array, rng.getrandbits(32))
+            if has_texcoord:
+                for _ in range(2):
+                    yield self._write(inline_array, int.from_bytes(_FLOAT.pack(rng.random()), "little"))
+        yield self._write(begin_end, 0)
+
+    def commands(self) -> Iterator[Any]:
+        """Yields the method writes of the configured trace."""
+        for _ in range(self.config.frames):
+            yield from self._frame_setup()
+            for _ in range(self.config.draws_per_frame):
+                yield from self._draw()
+
+
+def write_log(commands: Iterable[Any], stream, batch_size: int = 1 << 16) -> int:
+    """Writes commands to a text stream as xemu nv2a_pgraph_method trace lines, returning the number written."""
+    lines: list[str] = []
+    count = 0
+    for channel, nv_class, nv_op, nv_param in commands:
+        lines.append(f"nv2a_pgraph_method {channel}: 0x{nv_class:x} -> 0x{nv_op:04x} 0x{nv_param:x}\n")
+        if len(lines) == batch_size:
+            stream.write("".join(lines))
+            count += batch_size
+            lines.clear()
+
+    if lines:
+        stream.write("".join(lines))
+        count += len(lines)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", help="Path to the generated Python module")
+    parser.add_argument("output", help="File to write. Use '-' for stdout")
+    parser.add_argument(
+        "--format",
+        choices=["log", "raw"],
+        default="log",
+        help="Write xemu log lines or binary RAW_COMMAND_RECORD entries",
+    )
+    defaults = TraceConfig()
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--frames", type=int, default=defaults.frames)
+    parser.add_argument("--draws-per-frame", type=int, default=defaults.draws_per_frame)
+    parser.add_argument("--state-writes-per-draw", type=int, default=defaults.state_writes_per_draw)
+    parser.add_argument("--matrix-rate", type=float, default=defaults.matrix_rate)
+    parser.add_argument("--combiner-rate", type=float, default=defaults.combiner_rate)
+    parser.add_argument("--min-vertices", type=int, default=defaults.min_vertices)
+    parser.add_argument("--max-vertices", type=int, default=defaults.max_vertices)
+    parser.add_argument("--values-per-method", type=int, default=defaults.values_per_method)
+    args = parser.parse_args()
+
+    nv2a = load_generated_module(args.module)
+    config = TraceConfig(
+        seed=args.seed,
+        frames=args.frames,
+        draws_per_frame=args.draws_per_frame,
+        state_writes_per_draw=args.state_writes_per_draw,
+        matrix_rate=args.matrix_rate,
+        combiner_rate=args.combiner_rate,
+        min_vertices=args.min_vertices,
+        max_vertices=args.max_vertices,
+        values_per_method=args.values_per_method,
+    )
+    commands = SyntheticTraceGenerator(nv2a, config).commands()
+
+    if args.format == "log":
+        if args.output == "-":
+            count = write_log(commands, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as outfile:
+                count = write_log(commands, outfile)
+    elif args.output == "-":
+        count = nv2a.write_raw_commands(commands, sys.stdout.buffer)
+    else:
+        with open(args.output, "wb") as outfile:
+            count = nv2a.write_raw_commands(commands, outfile)
+
+    print(f"Wrote {count} commands", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
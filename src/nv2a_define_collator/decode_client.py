@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+# ruff: noqa: T201 `print` found
+import argparse
+import importlib.util
+import json
+import socket
+import struct
+import sys
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+# These mirror the protocol definitions in the generated module's DecodeServer so that clients need not import it.
+DECODE_SERVER_FRAME = struct.Struct("<BI")
+DECODE_OP_RAW = 1
+DECODE_OP_LOG = 2
+DECODE_OP_LOOKUP_NAMES = 3
+DECODE_OP_QUERY = 4
+DECODE_STATUS_OK = 0
+DECODE_STATUS_ERROR = 1
+DECODE_NAME_KEY_RECORD = struct.Struct("<2I")
+RAW_COMMAND_RECORD = struct.Struct("<4I")
+
+_COUNT = struct.Struct("<I")
+
+
+class DecodeServerError(RuntimeError):
+    """Raised when the decode server fails to process a request."""
+
+
+def _pack_records(record: struct.Struct, items: Sequence[Sequence[int]]) -> bytearray:
+    buffer = bytearray(record.size * len(items))
+    for offset, item in zip(range(0, len(buffer), record.size), items):
+        record.pack_into(buffer, offset, *item)
+    return buffer
+
+
+def _decode_string_list(payload: bytes) -> list[str]:
+    (count,) = _COUNT.unpack_from(payload)
+    lengths = struct.unpack_from(f"<{count}I", payload, _COUNT.size)
+    offset = _COUNT.size * (count + 1)
+    ret = []
+    for length in lengths:
+        ret.append(payload[offset : offset + length].decode())
+        offset += length
+    return ret
+
+
+class DecodeClient:
+    """Issues requests to a DecodeServer, reusing a single connection for every call."""
+
+    def __init__(self, path: str, timeout: float | None = None):
+        self.path = path
+        self.timeout = timeout
+        self._socket: socket.socket | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def _connect(self) -> socket.socket:
+        if not self._socket:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.path)
+        return self._socket
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> bytes:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = sock.recv_into(view[received:])
+            if not count:
+                self.close()
+                msg = "Decode server closed the connection"
+                raise DecodeServerError(msg)
+            received += count
+        return bytes(buffer)
+
+    def request(self, op: int, payload: bytes | bytearray) -> bytes:
+        """Sends a single request, returning the response payload."""
+        sock = self._connect()
+        try:
+            sock.sendall(DECODE_SERVER_FRAME.pack(op, len(payload)) + payload)
+            status, length = DECODE_SERVER_FRAME.unpack(self._recv_exactly(sock, DECODE_SERVER_FRAME.size))
+            response = self._recv_exactly(sock, length)
+        except OSError:
+            self.close()
+            raise
+
+        if status != DECODE_STATUS_OK:
+            raise DecodeServerError(response.decode())
+        return response
+
+    def decode_raw(self, commands: Sequence[Sequence[int]]) -> list[str]:
+        """Returns the pretty string of each (channel, class, op, param) command."""
+        return _decode_string_list(self.request(DECODE_OP_RAW, _pack_records(RAW_COMMAND_RECORD, commands)))
+
+    def decode_log(self, text: str) -> list[str]:
+        """Returns the pretty string of each method write in a block of xemu log text."""
+        return _decode_string_list(self.request(DECODE_OP_LOG, text.encode()))
+
+    def lookup_names(self, keys: Sequence[Sequence[int]]) -> list[str | None]:
+        """Returns the name of each (class, op) method, or None if it is unknown."""
+        names = _decode_string_list(self.request(DECODE_OP_LOOKUP_NAMES, _pack_records(DECODE_NAME_KEY_RECORD, keys)))
+        return [name or None for name in names]
+
+    def query(self, commands: Sequence[Sequence[int]], **query_args: Any) -> list[int]:
+        """Returns the indices of the commands matched by a TraceQuery built from `query_args`.
+
+        Collections of acceptable values must be JSON serializable (e.g., lists rather than ranges or sets).
+        """
+        spec = json.dumps(query_args, sort_keys=True).encode()
+        payload = _COUNT.pack(len(spec)) + spec + _pack_records(RAW_COMMAND_RECORD, commands)
+        response = self.request(DECODE_OP_QUERY, payload)
+        return list(struct.unpack(f"<{len(response) // 4}I", response))
+
+
+def _serve(args) -> int:
+    spec = importlib.util.spec_from_file_location("nv2a_generated", args.module)
+    if spec is None or spec.loader is None:
+        msg = f"Failed to load generated module {args.module}"
+        raise ImportError(msg)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    with module.DecodeServer(args.socket) as server:
+        print(f"Serving {args.module} on {args.socket}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _print_lines(lines: Iterable[str]):
+    for line in lines:
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Decodes nv2a method traces using a long running decode server.")
+    parser.add_argument("--socket", required=True, help="Path of the decode server's Unix domain socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Runs a decode server for a generated module")
+    serve.add_argument("module", help="Path to the generated Python module")
+
+    decode_log = subparsers.add_parser("decode-log", help="Decodes an xemu log (or stdin)")
+    decode_log.add_argument("log", nargs="?", help="Log file to decode")
+
+    lookup = subparsers.add_parser("lookup", help="Prints the names of methods")
+    lookup.add_argument("nv_class", type=lambda value: int(value, 0), help="Object class")
+    lookup.add_argument("nv_ops", nargs="+", type=lambda value: int(value, 0), help="Method offsets")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return _serve(args)
+
+    with DecodeClient(args.socket) as client:
+        if args.command == "decode-log":
+            if args.log:
+                with open(args.log) as infile:
+                    text = infile.read()
+            else:
+                text = sys.stdin.read()
+            _print_lines(client.decode_log(text))
+        elif args.command == "lookup":
+            names = client.lookup_names([(args.nv_class, nv_op) for nv_op in args.nv_ops])
+            _print_lines(f"0x{nv_op:x}: {name or '<unknown>'}" for nv_op, name in zip(args.nv_ops, names))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
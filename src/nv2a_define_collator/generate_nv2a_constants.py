@@ -4,20 +4,29 @@ from __future__ import annotations
 # ruff: noqa: FURB166 Use of `int` with explicit `base=16` after removing prefix
 # ruff: noqa: PERF403 Use a dictionary comprehension instead of a for-loop
 import argparse
+import contextlib
 import hashlib
 import importlib.resources as pkg_resources
+import json
+import keyword
 import logging
+import mmap
+import os
+import platform
 import re
 import sys
-from dataclasses import dataclass
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import requests
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
+    from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
@@ -349,6 +358,17 @@ CHILD_ASSOCIATION_OVERRIDE: dict[str, str] = {
     "NV097_SET_TRANSFORM_PROGRAM_START": "",
 }
 
+# Names of the object classes whose methods are defined in the headers. Classes not listed here are named after the
+# prefix of their methods (e.g., "NV097").
+CLASS_NAMES = {
+    0x19: "NV01_CONTEXT_CLIP_RECTANGLE",
+    0x42: "NV04_CONTEXT_SURFACES_2D",
+    0x57: "NV04_CONTEXT_COLOR_KEY",
+    0x62: "NV10_CONTEXT_SURFACES_2D",
+    0x97: "NV20_KELVIN_PRIMITIVE",
+    0x9F: "NV15_IMAGE_BLIT",
+}
+
 CUSTOM_NAMES = {
     (0x97, 0x1720): "NV097_SET_VERTEX_DATA_ARRAY_OFFSET__POS",
     (0x97, 0x1724): "NV097_SET_VERTEX_DATA_ARRAY_OFFSET__WEIGHT",
@@ -582,10 +602,14 @@ _name_sequential_operations(
 )
 
 _NUMERIC_VALUE = r"(?:0[x|X])?[0-9a-fA-F]+"
-PREFIXED_HEX_VALUE_RE = re.compile(r"(0[x|X][0-9a-fA-F]+)\s*$")
-BITSHIFT_VALUE_RE = re.compile(r"\(?(" + _NUMERIC_VALUE + r")\s*<<\s*(" + _NUMERIC_VALUE + r")\)?\s*$")
-RAW_INT_VALUE_RE = re.compile(r"(\d+)\s*$")
-PGRAPH_COMMAND_RE = re.compile(r"^#(\s*)define\s+(NV0[^\s]+)\s+(.*)")
+# Matches a prefixed hex value, a (possibly parenthesized) bit shift, or a decimal integer, in that order of precedence.
+NUMERIC_VALUE_RE = re.compile(
+    r"(?:(0[x|X][0-9a-fA-F]+)|\(?(" + _NUMERIC_VALUE + r")\s*<<\s*(" + _NUMERIC_VALUE + r")\)?|(\d+))\s*$"
+)
+# Matches a single NV0 define line within the raw contents of a header.
+PGRAPH_COMMAND_RE = re.compile(
+    rb"^#[^\S\r\n]*define[^\S\r\n]+(NV0\S+)(?:[^\S\r\n]+|(?=[\r\n]))([^\r\n]*)", re.MULTILINE
+)
 
 
 @dataclass
@@ -600,6 +624,12 @@ class PGRAPHCommand:
         camel_name = _to_camel_case(self.name)
         return f"Parse{camel_name}"
 
+    @property
+    def special_fields_name(self) -> str:
+        """Returns the name of the tuple type holding the decoded values for this command."""
+        camel_name = _to_camel_case(self.name)
+        return f"{camel_name}Fields"
+
 
 type PGRAPHCommandTree = dict[str, tuple[PGRAPHCommand, dict[int, tuple[PGRAPHCommand, dict[int, PGRAPHCommand]]]]]
 
@@ -665,6 +695,9 @@ def _fetch_files(output_dir: Path, *, force_update: bool) -> int:
         file_path, filename = _get_artifact_path(url, output_dir)
 
         if force_update or not file_path.exists():
+            # Imported lazily as the network stack is comparatively slow to load and is not needed for cached headers.
+            import requests
+
             try:
                 response = requests.get(url, timeout=10)
                 response.raise_for_status()
@@ -679,19 +712,16 @@ def _fetch_files(output_dir: Path, *, force_update: bool) -> int:
 
 
 def _extract_numeric_value(value_string: str) -> int | None:
-    match = PREFIXED_HEX_VALUE_RE.match(value_string)
-    if match:
-        return int(match.group(1), 16)
-
-    match = BITSHIFT_VALUE_RE.match(value_string)
-    if match:
-        return int(match.group(1), base=0) << int(match.group(2), base=0)
+    match = NUMERIC_VALUE_RE.match(value_string)
+    if not match:
+        return None
 
-    match = RAW_INT_VALUE_RE.match(value_string)
-    if match:
-        return int(match.group(1))
-
-    return None
+    hex_value, shift_value, shift_amount, int_value = match.groups()
+    if hex_value:
+        return int(hex_value, 16)
+    if shift_value:
+        return int(shift_value, base=0) << int(shift_amount, base=0)
+    return int(int_value)
 
 
 def _handle_special_case_value(pgraph_command) -> int | None:
@@ -736,32 +766,38 @@ def _sanitize_name(command_name: str) -> list[str]:
 
 
 def _process_header(file_path: Path) -> list[PGRAPHCommand]:
-    command_list = []
-
-    with open(file_path) as infile:
-        for line in infile:
-            if not line.startswith("#"):
-                continue
-
-            match = PGRAPH_COMMAND_RE.match(line)
-            if not match:
-                continue
-
-            symbol_names = _sanitize_name(match.group(2))
-            raw_value = match.group(3)
-            value = _extract_numeric_value(raw_value)
-            if value is None:
-                value = _handle_special_case_value(symbol_names[0])
+    command_list: list[PGRAPHCommand] = []
+
+    # The header is memory mapped and scanned for define lines as bytes, so that the (typically far more numerous)
+    # lines that do not define NV0 commands are never decoded.
+    with open(file_path, "rb") as infile:
+        if not os.fstat(infile.fileno()).st_size:
+            return command_list
+
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            for match in PGRAPH_COMMAND_RE.finditer(contents):
+                symbol_names = _sanitize_name(match.group(1).decode())
+                raw_value = match.group(2).decode()
+                value = _extract_numeric_value(raw_value)
                 if value is None:
-                    print(f"[{file_path}]: Failed to parse value from '{line.strip()}'", file=sys.stderr)
+                    value = _handle_special_case_value(symbol_names[0])
+                    if value is None:
+                        line = match.group(0).decode().strip()
+                        print(f"[{file_path}]: Failed to parse value from '{line}'", file=sys.stderr)
 
-            command_list.extend(
-                [PGRAPHCommand(name=symbol, raw_value=raw_value, numeric_value=value) for symbol in symbol_names]
-            )
+                command_list.extend(
+                    [PGRAPHCommand(name=symbol, raw_value=raw_value, numeric_value=value) for symbol in symbol_names]
+                )
 
     return command_list
 
 
+def _process_headers_in_pool(file_paths: list[Path], max_workers: int) -> list[list[PGRAPHCommand]]:
+    """Processes each header in a separate worker process, returning the results in the order of `file_paths`."""
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        return list(executor.map(_process_header, file_paths))
+
+
 def _map_children_to_parents(all_names: dict[str, list[str]]) -> dict[str, str]:
     min_len = min(len(components) for components in all_names.values())
 
@@ -858,6 +894,23 @@ def _build_name_map(command_tree: PGRAPHCommandTree) -> list[str]:
     return sorted([f'(0x{key[0]:X}, 0x{key[1]:X}): "{value}"' for key, value in entries.items()])
 
 
+def _build_class_names(command_tree: PGRAPHCommandTree) -> list[str]:
+    entries = dict(CLASS_NAMES)
+    for command, _ in command_tree.values():
+        if command.numeric_value is None:
+            continue
+
+        try:
+            prefix_str = command.name.split("_")[0]
+            class_prefix = int(prefix_str[2:], 16)
+        except (ValueError, IndexError):
+            continue
+
+        entries.setdefault(class_prefix, prefix_str)
+
+    return [f'0x{key:X}: "{value}"' for key, value in sorted(entries.items())]
+
+
 def _build_processor_map(command_tree: PGRAPHCommandTree) -> list[str]:
     nested_map: dict[int, dict[int, list[PGRAPHCommand]]] = {}
 
@@ -927,55 +980,55 @@ def _build_value_parser(
 ) -> list[str]:
     characters_to_remove = len(f"{parent_command.name}_")
 
-    result = ["    _VALUES = {"]
+    result = ["    VALUES = {"]
 
     for value in sorted(children_map):
         value_info, _ = children_map[value]
         symbolic_name = value_info.name[characters_to_remove:]
         result.append(f'        {value}: "{symbolic_name}",')
     result.append("    }")
-    result.append("    ret = _VALUES.get(nv_param)")
-    result.append("    if ret:")
-    result.append("        return ret")
-    result.append('    return f"0x{nv_param:X}?"')
 
     return result
 
 
-def _build_bitfield_parser(grandparent_cmd: PGRAPHCommand, children_map: dict) -> list[str]:
-    result = ["    results: list[str] = []"]
+def _to_field_name(short_name: str) -> str:
+    if short_name.isidentifier() and not keyword.iskeyword(short_name) and not short_name.startswith("_"):
+        return short_name
+    return f"F_{short_name}"
+
+
+def _build_bitfield_layout(grandparent_cmd: PGRAPHCommand, children_map: dict) -> list[str]:
+    result = []
 
     prefix_to_remove = f"{grandparent_cmd.name}_"
-    for child_cmd, grandchildren_map in children_map.values():
+    for child_cmd, _ in children_map.values():
         if child_cmd.numeric_value is None:
             continue
 
-        child_short_name = child_cmd.name[len(prefix_to_remove) :]
-        mask_hex = f"0x{child_cmd.numeric_value:X}"
+        field_name = _to_field_name(child_cmd.name[len(prefix_to_remove) :])
         shift = (child_cmd.numeric_value & -child_cmd.numeric_value).bit_length() - 1
+        mask_hex = f"0x{child_cmd.numeric_value >> shift:X}"
+        result.append(f'            BitField("{field_name}", {shift}, {mask_hex}),')
 
-        result.append(f"    field_val = (nv_param & {mask_hex}) >> {shift}")
-        fallback_value = f'results.append(f"{child_short_name}:0x{{field_val:X}}")'
+    return result
 
-        if not grandchildren_map:
-            result.append(f"    {fallback_value}")
-        else:
-            result.append("    field_map = {")
-            for grandchild_val, grandchild_cmd in grandchildren_map.items():
-                result.append(f'        0x{grandchild_val:X}: "{grandchild_cmd.name}",')
-            result.extend(
-                [
-                    "    }",
-                    "    if field_val in field_map:",
-                    "        grandchild_name = field_map[field_val]",
-                    f'        symbolic_part = grandchild_name.replace("{prefix_to_remove}", "", 1)',
-                    '        results.append(symbolic_part.replace("_", ":", 1))',
-                    "    else:",
-                    f"        {fallback_value}",
-                ]
-            )
-
-    result.append("    return f\"{{{', '.join(results)}}}\"")
+
+def _build_bitfield_values(grandparent_cmd: PGRAPHCommand, children_map: dict) -> list[str]:
+    result = ["    FIELD_VALUES = {"]
+
+    prefix_to_remove = f"{grandparent_cmd.name}_"
+    for child_cmd, grandchildren_map in children_map.values():
+        if child_cmd.numeric_value is None or not grandchildren_map:
+            continue
+
+        field_name = _to_field_name(child_cmd.name[len(prefix_to_remove) :])
+        result.append(f'        "{field_name}": {{')
+        for grandchild_val, grandchild_cmd in grandchildren_map.items():
+            symbolic_part = grandchild_cmd.name.replace(prefix_to_remove, "", 1)
+            result.append(f'            0x{grandchild_val:X}: "{symbolic_part}",')
+        result.append("        },")
+
+    result.append("    }")
 
     return result
 
@@ -996,27 +1049,74 @@ def _build_parser_functions(command_tree: PGRAPHCommandTree) -> list[str]:
 
         grandparent_cmd, children_map = command_tree[name]
         has_grandchildren = any(gc_map for _, gc_map in children_map.values())
-
-        result.append(f"def {grandparent_cmd.special_parser_name}(_nv_class, _nv_op, nv_param: int) -> str:")
-        result.append(f'    """Parses the components of a {name} command."""')
+        fields_name = grandparent_cmd.special_fields_name
 
         if has_grandchildren or name in BITFIELD_VALUE_COMMANDS:
-            result.extend(_build_bitfield_parser(grandparent_cmd, children_map))
+            result.append(f"class {fields_name}(")
+            result.append("    _bitfield_layout_tuple(")
+            result.append("        [")
+            result.extend(_build_bitfield_layout(grandparent_cmd, children_map))
+            result.append("        ]")
+            result.append("    )")
+            result.append("):")
+            result.append(f'    """Parses the components of a {name} command."""')
+            result.append("")
+            result.append("    __slots__ = ()")
+            if has_grandchildren:
+                result.append("")
+                result.extend(_build_bitfield_values(grandparent_cmd, children_map))
         else:
+            result.append(f"class {fields_name}(EnumParam):")
+            result.append(f'    """Parses the components of a {name} command."""')
+            result.append("")
+            result.append("    __slots__ = ()")
+            result.append("")
             result.extend(_build_value_parser(grandparent_cmd, children_map))
 
+        result.append("")
+        result.append("")
+        result.append(f"{grandparent_cmd.special_parser_name} = _string_processor({fields_name}.decode)")
+
     return result
 
 
-def _generate_python_file(command_tree: PGRAPHCommandTree, env: Environment) -> str:
-    template_context = {
-        "FLAT_CONSTANTS": _build_flat_constants_list(command_tree),
-        "NAME_MAP": _build_name_map(command_tree),
-        "PROCESSOR_MAP": _build_processor_map(command_tree),
-        "PARSERS": _build_parser_functions(command_tree),
+def _get_generator_version(env: Environment, templates: list[str], template_context: dict[str, list[str]]) -> str:
+    """Returns a digest of the templates and template context that determine the content of the generated module."""
+    if env.loader is None:
+        msg = "The template environment has no loader"
+        raise ValueError(msg)
+
+    digest = hashlib.blake2b(digest_size=16)
+    for template_name in templates:
+        source, _filename, _uptodate = env.loader.get_source(env, template_name)
+        digest.update(source.encode())
+    for key in sorted(template_context):
+        digest.update(key.encode())
+        for entry in template_context[key]:
+            digest.update(b"\0")
+            digest.update(entry.encode())
+    return digest.hexdigest()
+
+
+def _iter_python_file(
+    command_tree: PGRAPHCommandTree, env: Environment, profiler: GeneratorProfiler | None = None
+) -> Iterator[str]:
+    """Renders the generated module as a stream of text fragments."""
+    if profiler is None:
+        profiler = GeneratorProfiler(enabled=False)
+
+    context_builders = {
+        "FLAT_CONSTANTS": _build_flat_constants_list,
+        "NAME_MAP": _build_name_map,
+        "CLASS_NAMES": _build_class_names,
+        "PROCESSOR_MAP": _build_processor_map,
+        "PARSERS": _build_parser_functions,
     }
+    template_context = {}
+    for key, builder in context_builders.items():
+        with profiler.phase(builder.__name__):
+            template_context[key] = builder(command_tree)
 
-    ret = []
     templates = [
         "header.py.jinja2",
         "color_combiner_processors.py.jinja2",
@@ -1025,14 +1125,40 @@ def _generate_python_file(command_tree: PGRAPHCommandTree, env: Environment) ->
         "shader_processors.py.jinja2",
         "texture_processors.py.jinja2",
         "nv2a_constants.py.jinja2",
+        "redundancy_analysis.py.jinja2",
+        "trace_export.py.jinja2",
+        "parallel_decode.py.jinja2",
+        "vertex_reconstruction.py.jinja2",
+        "vertex_program.py.jinja2",
+        "combiner_program.py.jinja2",
+        "float_array_grouping.py.jinja2",
+        "trace_query.py.jinja2",
+        "log_ingestion.py.jinja2",
+        "trace_demux.py.jinja2",
+        "run_length_output.py.jinja2",
+        "bandwidth_estimation.py.jinja2",
+        "decode_server.py.jinja2",
+        "decode_cache.py.jinja2",
     ]
+    generator_version = _get_generator_version(env, templates, template_context)
+
     for template_name in templates:
-        template = env.get_template(template_name)
-        ret.append(template.render(template_context))
+        with profiler.phase(f"render:{template_name}"):
+            template = env.get_template(template_name)
+            yield from template.generate(template_context, GENERATOR_VERSION=generator_version)
+            yield "\n"
+
 
-    ret.append("")
+def _generate_python_file(
+    command_tree: PGRAPHCommandTree, env: Environment, profiler: GeneratorProfiler | None = None
+) -> str:
+    return "".join(_iter_python_file(command_tree, env, profiler))
 
-    return "\n".join(ret)
+
+def _write_python_file(
+    outfile: TextIO, command_tree: PGRAPHCommandTree, env: Environment, profiler: GeneratorProfiler | None = None
+):
+    outfile.writelines(_iter_python_file(command_tree, env, profiler))
 
 
 def _merge_new_commands(all_commands: PGRAPHCommandTree, new_commands: PGRAPHCommandTree):
@@ -1051,7 +1177,72 @@ def _get_jinja2_env() -> Environment:
         script_dir = Path(__file__).parent
         template_dir_path = script_dir / "templates"
 
-    return Environment(loader=FileSystemLoader(str(template_dir_path)), autoescape=True)
+    # Compiled templates are cached in the system temp directory, keyed by template name and source checksum.
+    return Environment(
+        loader=FileSystemLoader(str(template_dir_path)), autoescape=True, bytecode_cache=FileSystemBytecodeCache()
+    )
+
+
+@dataclass
+class PhaseProfile:
+    name: str
+
+    # Includes the overhead of tracemalloc, which slows allocation heavy phases considerably.
+    wall_seconds: float
+
+    # Peak traced memory during the phase, less the memory that was already traced when it began.
+    peak_bytes: int
+
+
+@dataclass
+class GeneratorProfiler:
+    """Records the wall time and peak memory allocated by each phase of generation.
+
+    Phases must not be nested, as the tracemalloc peak is reset at the start of each one. Wall times are measured while
+    tracemalloc is running and so are only comparable with each other, not with untraced runs.
+    """
+
+    enabled: bool = True
+    phases: list[PhaseProfile] = field(default_factory=list)
+
+    def start(self):
+        if self.enabled:
+            tracemalloc.start()
+
+    def stop(self):
+        if self.enabled:
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        tracemalloc.reset_peak()
+        start_bytes, _peak = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _current, peak = tracemalloc.get_traced_memory()
+            self.phases.append(PhaseProfile(name, elapsed, peak - start_bytes))
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "python": platform.python_version(),
+                "wall_seconds_include_tracing": True,
+                "total_wall_seconds": sum(phase.wall_seconds for phase in self.phases),
+                "peak_bytes": max((phase.peak_bytes for phase in self.phases), default=0),
+                "phases": [
+                    {"name": phase.name, "wall_seconds": phase.wall_seconds, "peak_bytes": phase.peak_bytes}
+                    for phase in self.phases
+                ],
+            },
+            indent=2,
+        )
 
 
 def main() -> int:
@@ -1069,6 +1260,20 @@ def main() -> int:
         metavar="filename",
         help="Writes output to the given file instead of stdout",
     )
+    parser.add_argument(
+        "--profile",
+        metavar="filename",
+        help="Writes the wall time and peak memory of each generation phase to the given file as JSON. Memory is "
+        "traced while profiling, so the times include tracing overhead",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="count",
+        help="Number of worker processes used to parse the header files",
+    )
     args = parser.parse_args()
 
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -1077,27 +1282,49 @@ def main() -> int:
     output_dir = Path("../../headers")
     output_dir.mkdir(exist_ok=True)
 
-    ret = _fetch_files(output_dir, force_update=args.update)
+    profiler = GeneratorProfiler(enabled=bool(args.profile))
+    profiler.start()
+
+    with profiler.phase("fetch"):
+        ret = _fetch_files(output_dir, force_update=args.update)
     if ret:
         return ret
 
     all_commands: PGRAPHCommandTree = {}
 
-    for url in SOURCES:
-        file_path, _filename = _get_artifact_path(url, output_dir)
-        commands = _process_header(file_path)
-        command_tree = _build_command_tree(commands)
-        _merge_new_commands(all_commands, command_tree)
-
-    _merge_new_commands(all_commands, EXTRAS)
-
-    output = _generate_python_file(all_commands, _get_jinja2_env())
-
+    file_paths = [_get_artifact_path(url, output_dir)[0] for url in SOURCES]
+    if args.jobs > 1:
+        # Phases are not nested, so the headers are profiled as a whole when parsed concurrently.
+        with profiler.phase("_process_header:*"):
+            headers = _process_headers_in_pool(file_paths, args.jobs)
+    else:
+        headers = []
+        for file_path in file_paths:
+            with profiler.phase(f"_process_header:{file_path.name}"):
+                headers.append(_process_header(file_path))
+
+    for file_path, commands in zip(file_paths, headers, strict=True):
+        source = file_path.name
+        with profiler.phase(f"_build_command_tree:{source}"):
+            command_tree = _build_command_tree(commands)
+        with profiler.phase(f"_merge_new_commands:{source}"):
+            _merge_new_commands(all_commands, command_tree)
+
+    with profiler.phase("_merge_new_commands:EXTRAS"):
+        _merge_new_commands(all_commands, EXTRAS)
+
+    env = _get_jinja2_env()
     if args.output:
         with open(args.output, "w") as outfile:
-            outfile.write(output)
+            _write_python_file(outfile, all_commands, env, profiler)
     else:
-        print(output)
+        _write_python_file(sys.stdout, all_commands, env, profiler)
+        print()
+    profiler.stop()
+
+    if args.profile:
+        with open(args.profile, "w") as outfile:
+            outfile.write(profiler.to_json())
 
     return 0
 
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+from nv2a_define_collator.generate_nv2a_constants import (
+    EXTRAS,
+    _build_command_tree,
+    _generate_python_file,
+    _get_jinja2_env,
+    _merge_new_commands,
+    _process_header,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def generated_module_path(tmp_path_factory) -> Path:
+    """Generates the constants module from the fixture header."""
+    all_commands: dict = {}
+    _merge_new_commands(all_commands, _build_command_tree(_process_header(FIXTURES_DIR / "nv2a_regs.h")))
+    _merge_new_commands(all_commands, EXTRAS)
+
+    path = tmp_path_factory.mktemp("generated") / "nv2a_generated.py"
+    path.write_text(_generate_python_file(all_commands, _get_jinja2_env()))
+    return path
+
+
+@pytest.fixture(scope="session")
+def nv2a(generated_module_path):
+    """The generated module, imported once per session."""
+    spec = importlib.util.spec_from_file_location("nv2a_generated", generated_module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
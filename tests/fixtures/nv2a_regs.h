@@ -0,0 +1,149 @@
+#define NV_KELVIN_PRIMITIVE 0x00000097
+#define NV097_SET_OBJECT 0x00000000
+#define NV097_NO_OPERATION 0x00000100
+#define NV097_WAIT_FOR_IDLE 0x00000110
+#define NV097_FLIP_STALL 0x00000130
+#define NV097_SET_SURFACE_CLIP_HORIZONTAL 0x00000200
+#define NV097_SET_SURFACE_CLIP_VERTICAL 0x00000204
+#define NV097_SET_SURFACE_FORMAT 0x00000208
+#   define NV097_SET_SURFACE_FORMAT_COLOR 0x0000000F
+#   define NV097_SET_SURFACE_FORMAT_COLOR_LE_R5G6B5 0x03
+#   define NV097_SET_SURFACE_FORMAT_COLOR_LE_A8R8G8B8 0x08
+#   define NV097_SET_SURFACE_FORMAT_ZETA 0x000000F0
+#define NV097_SET_SURFACE_PITCH 0x0000020C
+#define NV097_SET_SURFACE_COLOR_OFFSET 0x00000210
+#define NV097_SET_SURFACE_ZETA_OFFSET 0x00000214
+#define NV097_SET_COMBINER_ALPHA_ICW 0x00000260
+#define NV097_SET_COMBINER_SPECULAR_FOG_CW0 0x00000288
+#define NV097_SET_COMBINER_SPECULAR_FOG_CW1 0x0000028C
+#define NV097_SET_CONTROL0 0x00000290
+#   define NV097_SET_CONTROL0_Z_FORMAT_FLOAT NV097_SET_CONTROL0_Z_FORMAT_FLOAT_X
+#define NV097_SET_LIGHT_CONTROL 0x00000294
+#define NV097_SET_COLOR_MATERIAL 0x00000298
+#define NV097_SET_FOG_MODE 0x0000029C
+#   define NV097_SET_FOG_MODE_V_LINEAR 0x2601
+#   define NV097_SET_FOG_MODE_V_EXP 0x800
+#define NV097_SET_FOG_ENABLE 0x000002A4
+#define NV097_SET_FOG_COLOR 0x000002A8
+#   define NV097_SET_FOG_COLOR_RED 0x000000FF
+#   define NV097_SET_FOG_COLOR_GREEN 0x0000FF00
+#   define NV097_SET_FOG_COLOR_BLUE 0x00FF0000
+#   define NV097_SET_FOG_COLOR_ALPHA 0xFF000000
+#define NV097_SET_ALPHA_TEST_ENABLE 0x00000300
+#define NV097_SET_BLEND_ENABLE 0x00000304
+#define NV097_SET_CULL_FACE_ENABLE 0x00000308
+#define NV097_SET_DEPTH_TEST_ENABLE 0x0000030C
+#define NV097_SET_LIGHTING_ENABLE 0x00000314
+#define NV097_SET_STENCIL_TEST_ENABLE 0x0000032C
+#define NV097_SET_ALPHA_FUNC 0x0000033C
+#define NV097_SET_ALPHA_REF 0x00000340
+#define NV097_SET_BLEND_FUNC_SFACTOR 0x00000344
+#   define NV097_SET_BLEND_FUNC_SFACTOR_V_ZERO 0x0000
+#   define NV097_SET_BLEND_FUNC_SFACTOR_V_ONE 0x0001
+#   define NV097_SET_BLEND_FUNC_SFACTOR_V_SRC_ALPHA 0x0302
+#define NV097_SET_BLEND_FUNC_DFACTOR 0x00000348
+#   define NV097_SET_BLEND_FUNC_DFACTOR_V_ZERO 0x0000
+#   define NV097_SET_BLEND_FUNC_DFACTOR_V_ONE_MINUS_SRC_ALPHA 0x0303
+#define NV097_SET_DEPTH_FUNC 0x00000354
+#   define NV097_SET_DEPTH_FUNC_V_LESS 0x00000201
+#   define NV097_SET_DEPTH_FUNC_V_LEQUAL 0x00000203
+#define NV097_SET_COLOR_MASK 0x00000358
+#define NV097_SET_DEPTH_MASK 0x0000035C
+#define NV097_SET_STENCIL_FUNC 0x00000364
+#define NV097_SET_STENCIL_OP_FAIL 0x00000370
+#define NV097_SET_STENCIL_OP_ZFAIL 0x00000374
+#define NV097_SET_STENCIL_OP_ZPASS 0x00000378
+#   define NV097_SET_STENCIL_OP_V_KEEP 0x1E00
+#   define NV097_SET_STENCIL_OP_V_REPLACE 0x1E01
+#define NV097_SET_LINE_WIDTH 0x00000380
+#   define NV097_SET_LINE_WIDTH_MASK (64 << 3) - 1
+#define NV097_SET_CULL_FACE 0x0000039C
+#   define NV097_SET_CULL_FACE_V_FRONT 0x404
+#   define NV097_SET_CULL_FACE_V_BACK 0x405
+#   define NV097_SET_CULL_FACE_V_FRONT_AND_BACK 0x408
+#define NV097_SET_MATERIAL_EMISSION 0x000003A8
+#define NV097_SET_LIGHT_ENABLE_MASK 0x000003BC
+#define NV097_SET_TEXGEN_S 0x000003C0
+#define NV097_SET_TEXGEN_T 0x000003C4
+#define NV097_SET_TEXGEN_R 0x000003C8
+#define NV097_SET_TEXGEN_Q 0x000003CC
+#define NV097_SET_TEXTURE_MATRIX_ENABLE 0x00000420
+#define NV097_SET_POINT_SIZE 0x0000043C
+#define NV097_SET_PROJECTION_MATRIX 0x00000440
+#define NV097_SET_MODEL_VIEW_MATRIX 0x00000480
+#define NV097_SET_INVERSE_MODEL_VIEW_MATRIX 0x00000580
+#define NV097_SET_COMPOSITE_MATRIX 0x00000680
+#define NV097_SET_TEXTURE_MATRIX 0x000006C0
+#define NV097_SET_FOG_PARAMS 0x000009C0
+#define NV097_SET_VIEWPORT_OFFSET 0x00000A20
+#define NV097_SET_COMBINER_FACTOR0 0x00000A60
+#define NV097_SET_COMBINER_FACTOR1 0x00000A80
+#define NV097_SET_COMBINER_ALPHA_OCW 0x00000AA0
+#define NV097_SET_COMBINER_COLOR_ICW 0x00000AC0
+#define NV097_SET_VIEWPORT_SCALE 0x00000AF0
+#define NV097_SET_TRANSFORM_PROGRAM 0x00000B00
+#define NV097_SET_TRANSFORM_CONSTANT 0x00000B80
+#define NV097_SET_LIGHT_AMBIENT_COLOR 0x00001000
+#define NV097_SET_LIGHT_DIFFUSE_COLOR 0x0000100C
+#define NV097_SET_LIGHT_LOCAL_POSITION 0x0000105C
+#define NV097_SET_VERTEX3F 0x00001500
+#define NV097_SET_VERTEX4F 0x00001518
+#define NV097_SET_NORMAL3F 0x00001530
+#define NV097_SET_DIFFUSE_COLOR4F 0x00001550
+#define NV097_SET_TEXCOORD0_2F 0x00001590
+#define NV097_SET_VERTEX_DATA_ARRAY_OFFSET 0x00001720
+#define NV097_SET_VERTEX_DATA_ARRAY_FORMAT 0x00001760
+#define NV097_SET_BEGIN_END 0x000017FC
+#   define NV097_SET_BEGIN_END_OP_END 0x00
+#   define NV097_SET_BEGIN_END_OP_POINTS 0x01
+#   define NV097_SET_BEGIN_END_OP_LINES 0x02
+#   define NV097_SET_BEGIN_END_OP_TRIANGLES 0x05
+#   define NV097_SET_BEGIN_END_OP_TRIANGLE_STRIP 0x06
+#   define NV097_SET_BEGIN_END_OP_QUADS 0x08
+#define NV097_ARRAY_ELEMENT16 0x00001800
+#define NV097_ARRAY_ELEMENT32 0x00001808
+#define NV097_DRAW_ARRAYS 0x00001810
+#define NV097_INLINE_ARRAY 0x00001818
+#define NV097_SET_VERTEX_DATA2F_M 0x00001880
+#define NV097_SET_VERTEX_DATA2S 0x00001900
+#define NV097_SET_VERTEX_DATA4UB 0x00001940
+#define NV097_SET_VERTEX_DATA4S_M 0x00001980
+#define NV097_SET_VERTEX_DATA4F_M 0x00001A00
+#define NV097_SET_TEXTURE_OFFSET 0x00001B00
+#define NV097_SET_TEXTURE_FORMAT 0x00001B04
+#define NV097_SET_TEXTURE_ADDRESS 0x00001B08
+#define NV097_SET_TEXTURE_CONTROL0 0x00001B0C
+#define NV097_SET_TEXTURE_CONTROL1 0x00001B10
+#define NV097_SET_TEXTURE_FILTER 0x00001B14
+#define NV097_SET_TEXTURE_IMAGE_RECT 0x00001B1C
+#define NV097_SET_TEXTURE_PALETTE 0x00001B20
+#define NV097_SET_SEMAPHORE_OFFSET 0x00001D6C
+#define NV097_SET_COLOR_CLEAR_VALUE 0x00001D90
+#define NV097_CLEAR_SURFACE 0x00001D94
+#define NV097_SET_CLEAR_RECT_HORIZONTAL 0x00001D98
+#define NV097_SET_CLEAR_RECT_VERTICAL 0x00001D9C
+#define NV097_SET_SPECULAR_FOG_FACTOR 0x00001E20
+#define NV097_SET_COMBINER_COLOR_OCW 0x00001E40
+#define NV097_SET_COMBINER_CONTROL 0x00001E60
+#define NV097_SET_SHADER_STAGE_PROGRAM 0x00001E70
+#define NV097_SET_DOT_RGBMAPPING 0x00001E74
+#define NV097_SET_SHADER_OTHER_STAGE_INPUT 0x00001E78
+#define NV097_SET_TRANSFORM_DATA 0x00001E80
+#define NV097_LAUNCH_TRANSFORM_PROGRAM 0x00001E90
+#define NV097_SET_TRANSFORM_EXECUTION_MODE 0x00001E94
+#define NV097_SET_TRANSFORM_PROGRAM_CXT_WRITE_EN 0x00001E98
+#define NV097_SET_TRANSFORM_PROGRAM_LOAD 0x00001E9C
+#define NV097_SET_TRANSFORM_PROGRAM_START 0x00001EA0
+#define NV097_SET_TRANSFORM_CONSTANT_LOAD 0x00001EA4
+#define NV062_SET_OBJECT 0x00000000
+#define NV062_SET_COLOR_FORMAT 0x00000300
+#   define NV062_SET_COLOR_FORMAT_LE_Y8 0x01
+#   define NV062_SET_COLOR_FORMAT_LE_A8R8G8B8 0x0A
+#define NV062_SET_PITCH 0x00000304
+#define NV062_SET_OFFSET_SOURCE 0x00000308
+#define NV062_SET_OFFSET_DESTIN 0x0000030C
+#define NV097_SET_ANTI_ALIASING_CONTROL 0x00001D7C
+#   define NV097_SET_ANTI_ALIASING_CONTROL_ENABLE 0x00000001
+#       define NV097_SET_ANTI_ALIASING_CONTROL_ENABLE_FALSE 0x00000000
+#       define NV097_SET_ANTI_ALIASING_CONTROL_ENABLE_TRUE 0x00000001
+#   define NV097_SET_ANTI_ALIASING_CONTROL_SAMPLE_MASK 0xFFFF0000
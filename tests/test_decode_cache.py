@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import gzip
+import os
+
+import pytest
+
+
+@pytest.fixture
+def trace_path(nv2a, tmp_path):
+    lines = [
+        f"nv2a_pgraph_method 0: 0x97 -> 0x{nv2a.NV097_SET_DEPTH_FUNC:x} 0x{0x200 + index % 8:x}" for index in range(64)
+    ]
+    path = tmp_path / "trace.log.gz"
+    path.write_bytes(gzip.compress("\n".join(lines).encode()))
+    return str(path)
+
+
+def _rows(cached) -> list[tuple]:
+    rows = []
+    for chunk in cached.chunks():
+        rows.extend(zip(*(list(chunk[name]) for name in ("channel", "nv_class", "nv_op", "nv_param", "op_name"))))
+    return rows
+
+
+def _entries(directory) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".nv2acol"))
+
+
+def test_load_caches_decoded_traces(nv2a, tmp_path, trace_path):
+    cache = nv2a.DecodeCache(str(tmp_path / "cache"))
+    digest = nv2a.trace_file_digest(trace_path)
+
+    assert cache.get(digest) is None
+    with cache.load(trace_path) as cached:
+        rows = _rows(cached)
+    assert _entries(cache.directory) == [f"{digest}-{nv2a.GENERATOR_VERSION}.nv2acol"]
+
+    assert len(rows) == 64
+    assert rows[3] == (0, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203, "NV097_SET_DEPTH_FUNC")
+
+    with cache.get(digest) as hit:
+        assert hit.path == cached.path
+        assert _rows(hit) == rows
+    with cache.load(trace_path) as hit:
+        assert _rows(hit) == rows
+
+
+def test_load_raw_traces(nv2a, tmp_path):
+    commands = [nv2a.RawCommand(1, 0x97, nv2a.NV097_SET_BLEND_ENABLE, index & 1) for index in range(10)]
+    path = tmp_path / "trace.bin"
+    path.write_bytes(b"".join(nv2a.RAW_COMMAND_RECORD.pack(*command) for command in commands))
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+    cache = nv2a.DecodeCache(str(tmp_path / "cache"))
+
+    with cache.load(str(path), raw=True) as cached:
+        assert [row[:4] for row in _rows(cached)] == commands
+    with cache.load(str(empty_path), raw=True) as cached:
+        assert _rows(cached) == []
+
+
+def test_entries_from_other_versions_are_invalidated(nv2a, tmp_path, trace_path):
+    cache = nv2a.DecodeCache(str(tmp_path / "cache"))
+    digest = nv2a.trace_file_digest(trace_path)
+    stale = os.path.join(cache.directory, f"{digest}-0123456789abcdef.nv2acol")
+    with open(stale, "wb") as outfile:
+        outfile.write(b"stale")
+    unrelated = os.path.join(cache.directory, "notes.txt")
+    with open(unrelated, "w") as outfile:
+        outfile.write("kept")
+
+    assert cache.get(digest) is None
+    cache.load(trace_path).close()
+
+    assert _entries(cache.directory) == [f"{digest}-{nv2a.GENERATOR_VERSION}.nv2acol"]
+    assert os.path.exists(unrelated)
+
+
+def test_least_recently_used_entries_are_evicted(nv2a, tmp_path):
+    cache = nv2a.DecodeCache(str(tmp_path / "cache"), max_bytes=0)
+    commands = [nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203)] * 4
+    cache.put("a", commands).close()
+    entry_size = os.path.getsize(cache._entry_path("a"))
+    cache.max_bytes = 2 * entry_size
+
+    cache.put("b", commands).close()
+    os.utime(cache._entry_path("a"), (1, 1))
+    os.utime(cache._entry_path("b"), (2, 2))
+    cache.get("a").close()
+    cache.put("c", commands).close()
+
+    assert cache.get("b") is None
+    assert {"a", "c"} == {name.split("-")[0] for name in _entries(cache.directory)}
+
+
+def test_newest_entry_is_kept_even_when_over_budget(nv2a, tmp_path):
+    cache = nv2a.DecodeCache(str(tmp_path / "cache"), max_bytes=0)
+    commands = [nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203)]
+
+    cache.put("a", commands).close()
+    with cache.put("b", commands) as cached:
+        assert [row[:4] for row in _rows(cached)] == commands
+
+    assert [name.split("-")[0] for name in _entries(cache.directory)] == ["b"]
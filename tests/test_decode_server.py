@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from nv2a_define_collator.decode_client import DecodeClient, DecodeServerError
+
+
+@pytest.fixture
+def socket_path():
+    # Unix domain socket paths are limited to ~100 bytes, which pytest's tmp_path can exceed.
+    with tempfile.TemporaryDirectory(prefix="nv2a") as directory:
+        yield os.path.join(directory, "decode.sock")
+
+
+@pytest.fixture
+def server(nv2a, socket_path):
+    server = nv2a.DecodeServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.close()
+
+
+@pytest.fixture
+def client(server):
+    with DecodeClient(server.path, timeout=10) as client:
+        yield client
+
+
+def test_decode_raw(nv2a, client):
+    commands = [(0, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203), (1, 0x62, nv2a.NV062_SET_PITCH, 0x01000100)]
+
+    assert client.decode_raw(commands) == [nv2a.get_command_info(*command).get_pretty_string() for command in commands]
+    assert client.decode_raw([]) == []
+
+
+def test_decode_log(nv2a, client):
+    text = "nv2a: unrelated\nnv2a_pgraph_method 0: 0x97 -> 0x354 0x203\nnv2a_pgraph_method 0: 0x97 -> 0x304 0x1\n"
+
+    assert client.decode_log(text) == [
+        "nv2a_pgraph_method 0: 0x97 -> NV097_SET_DEPTH_FUNC<0x354> (V_LEQUAL <0x203>)",
+        "nv2a_pgraph_method 0: 0x97 -> NV097_SET_BLEND_ENABLE<0x304> (TRUE <0x1>)",
+    ]
+
+
+def test_lookup_names(nv2a, client):
+    assert client.lookup_names([(0x97, nv2a.NV097_SET_DEPTH_FUNC), (0x97, 0x1FFC)]) == ["NV097_SET_DEPTH_FUNC", None]
+
+
+def test_query(nv2a, client):
+    commands = [
+        (0, 0x97, nv2a.NV097_SET_TEXTURE_FORMAT, 0x0001012A),
+        (0, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203),
+        (1, 0x97, nv2a.NV097_SET_TEXTURE_FORMAT, 0x00010629),
+        (0, 0x97, nv2a.NV097_SET_TEXTURE_FORMAT, 0x00010C29),
+    ]
+    query_args = {"names": ["SET_TEXTURE_FORMAT"], "fields": {"COLOR": ["SZ_AY8", "L_DXT1_A1R5G5B5"]}}
+
+    assert client.query(commands, **query_args) == [0, 3]
+    # Repeated queries reuse the compiled TraceQuery.
+    assert client.query(commands, **query_args) == [0, 3]
+    assert client.query(commands, channels=[1]) == [2]
+
+
+def test_errors_are_reported_and_the_connection_remains_usable(nv2a, client):
+    with pytest.raises(DecodeServerError, match="Unknown decode server opcode 99"):
+        client.request(99, b"")
+    with pytest.raises(DecodeServerError, match="No method matching the query"):
+        client.query([], names=["SET_DEPTH_FUNC"], fields={"COLOR": 1})
+    with pytest.raises(DecodeServerError, match="JSONDecodeError"):
+        client.request(4, b"\x03\x00\x00\x00{{{")
+
+    assert client.lookup_names([(0x97, nv2a.NV097_SET_DEPTH_FUNC)]) == ["NV097_SET_DEPTH_FUNC"]
+
+
+def test_connections_are_served_concurrently(nv2a, server):
+    with DecodeClient(server.path, timeout=10) as first, DecodeClient(server.path, timeout=10) as second:
+        key = (0x97, nv2a.NV097_SET_DEPTH_FUNC)
+        assert first.lookup_names([key]) == second.lookup_names([key]) == ["NV097_SET_DEPTH_FUNC"]
+
+
+def test_client_reports_a_closed_connection(server):
+    with DecodeClient(server.path, timeout=10) as client:
+        sock = client._connect()
+        # A truncated request makes the server drop the connection.
+        sock.sendall(b"\x01\x10\x00\x00\x00")
+        sock.shutdown(socket.SHUT_WR)
+        with pytest.raises(DecodeServerError, match="closed the connection"):
+            client._recv_exactly(sock, 1)
+
+
+def test_refuses_a_socket_that_is_still_served(nv2a, server):
+    with pytest.raises(RuntimeError, match="already listening"):
+        nv2a.DecodeServer(server.path)
+
+
+def test_replaces_a_stale_socket(nv2a, socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+
+    with nv2a.DecodeServer(socket_path) as server:
+        assert server.path == socket_path
+
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import random
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def log_text(nv2a):
+    rng = random.Random(2)
+    lines = []
+    for index in range(2000):
+        if index % 7 == 0:
+            lines.append(f"nv2a: unrelated message {index}")
+        lines.append(
+            f"nv2a_pgraph_method {rng.randrange(2)}: 0x97 -> 0x{rng.randrange(0x2000) & ~3:x} 0x{rng.getrandbits(32):x}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize(
+    ("suffix", "compress"),
+    [("log", None), ("log.gz", gzip.compress), ("log.xz", lzma.compress), ("log.bz2", bz2.compress)],
+)
+def test_reads_every_format(nv2a, log_text, tmp_path, suffix, compress):
+    data = log_text.encode()
+    path = tmp_path / f"trace.{suffix}"
+    path.write_bytes(compress(data) if compress else data)
+
+    reader = nv2a.LogFileReader(str(path), chunk_size=997, queue_depth=2)
+
+    assert reader.compressed == (compress is not None)
+    chunks = list(reader.chunks())
+    assert "".join(chunks) == log_text
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert reader.bytes_read == len(data)
+    assert list(reader.commands()) == list(nv2a.iter_log_commands(log_text.splitlines()))
+
+
+def test_unterminated_last_line(nv2a, tmp_path):
+    path = tmp_path / "trace.log.gz"
+    path.write_bytes(gzip.compress(b"nv2a_pgraph_method 0: 0x97 -> 0x1800 0x1"))
+
+    assert list(nv2a.LogFileReader(str(path), chunk_size=4).commands()) == [nv2a.RawCommand(0, 0x97, 0x1800, 1)]
+
+
+def test_stopping_early_releases_the_decompressor(nv2a, log_text, tmp_path):
+    path = tmp_path / "trace.log.xz"
+    path.write_bytes(lzma.compress(log_text.encode()))
+
+    chunks = nv2a.LogFileReader(str(path), chunk_size=64, queue_depth=1).chunks()
+    next(chunks)
+    chunks.close()
+
+
+def test_corrupt_log_raises_in_the_reader(nv2a, tmp_path):
+    path = tmp_path / "trace.log.gz"
+    path.write_bytes(gzip.compress(b"x" * 4096)[:-16])
+
+    with pytest.raises(EOFError):
+        list(nv2a.LogFileReader(str(path)).chunks())
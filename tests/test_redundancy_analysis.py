@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+
+def _commands(nv2a, *writes):
+    return [nv2a.RawCommand(0, 0x97, nv_op, nv_param) for nv_op, nv_param in writes]
+
+
+def test_repeated_state_write_is_redundant(nv2a):
+    detector = nv2a.RedundantStateDetector()
+    commands = _commands(
+        nv2a,
+        (nv2a.NV097_SET_DEPTH_FUNC, 0x201),
+        (nv2a.NV097_SET_DEPTH_FUNC, 0x201),
+        (nv2a.NV097_SET_DEPTH_FUNC, 0x203),
+        (nv2a.NV097_SET_DEPTH_FUNC, 0x203),
+    )
+
+    redundant = list(detector.feed_commands(commands))
+
+    assert [write.index for write in redundant] == [1, 3]
+    assert detector.redundant_bytes == 8
+
+
+def test_stateless_methods_and_vertex_data_are_never_redundant(nv2a):
+    detector = nv2a.RedundantStateDetector()
+    commands = _commands(
+        nv2a,
+        (nv2a.NV097_NO_OPERATION, 0),
+        (nv2a.NV097_NO_OPERATION, 0),
+        (nv2a.NV097_SET_BEGIN_END, 5),
+        (nv2a.NV097_INLINE_ARRAY, 0x3F800000),
+        (nv2a.NV097_INLINE_ARRAY, 0x3F800000),
+        (nv2a.NV097_SET_BEGIN_END, 0),
+    )
+
+    assert not list(detector.feed_commands(commands))
+    assert detector.draws == 1
+
+
+def test_report_orders_by_redundant_writes(nv2a):
+    detector = nv2a.RedundantStateDetector()
+    commands = _commands(
+        nv2a,
+        (nv2a.NV097_SET_DEPTH_FUNC, 0x201),
+        (nv2a.NV097_SET_BLEND_ENABLE, 1),
+        (nv2a.NV097_SET_BLEND_ENABLE, 1),
+        (nv2a.NV097_SET_BLEND_ENABLE, 1),
+    )
+    list(detector.feed_commands(commands))
+
+    report = detector.report()
+
+    assert report[0].name == "NV097_SET_BLEND_ENABLE"
+    assert (report[0].writes, report[0].redundant_writes, report[0].redundant_bytes) == (3, 2, 8)
+    assert report[1].name == "NV097_SET_DEPTH_FUNC"
+    assert report[1].redundant_writes == 0
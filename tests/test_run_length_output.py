@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+
+
+def _commands(nv2a, *writes):
+    return [nv2a.RawCommand(channel, 0x97, nv_op, nv_param) for channel, nv_op, nv_param in writes]
+
+
+def test_runs_collapse_consecutive_writes_to_a_method(nv2a):
+    depth_func = nv2a.NV097_SET_DEPTH_FUNC
+    blend = nv2a.NV097_SET_BLEND_ENABLE
+    commands = _commands(
+        nv2a,
+        (0, depth_func, 0x201),
+        (0, depth_func, 0x201),
+        (0, depth_func, 0x203),
+        (0, depth_func, 0x202),
+        (1, depth_func, 0x202),
+        (1, blend, 1),
+        (1, blend, 1),
+    )
+
+    runs = list(nv2a.iter_command_runs(commands))
+
+    assert [(run.index, run.count, run.distinct_params) for run in runs] == [(0, 4, 3), (4, 1, 1), (5, 2, 1)]
+    assert (runs[0].min_param, runs[0].max_param, runs[0].last_param) == (0x201, 0x203, 0x202)
+    assert [run.is_repeat for run in runs] == [False, True, True]
+    assert runs[2].command == commands[5]
+
+
+def test_runs_only_collapse_repeated_params_on_request(nv2a):
+    depth_func = nv2a.NV097_SET_DEPTH_FUNC
+    commands = _commands(nv2a, (0, depth_func, 0x201), (0, depth_func, 0x201), (0, depth_func, 0x203))
+
+    runs = list(nv2a.iter_command_runs(commands, collapse_same_op=False))
+
+    assert [(run.index, run.count, run.last_param) for run in runs] == [(0, 2, 0x201), (2, 1, 0x203)]
+
+
+def test_runs_cover_every_command(nv2a):
+    rng = random.Random(4)
+    ops = [nv2a.NV097_SET_DEPTH_FUNC, nv2a.NV097_SET_BLEND_ENABLE]
+    commands = _commands(nv2a, *((rng.randrange(2), rng.choice(ops), rng.randrange(3)) for _ in range(1000)))
+
+    for collapse_same_op in (True, False):
+        expanded = []
+        for run in nv2a.iter_command_runs(commands, collapse_same_op=collapse_same_op):
+            run_commands = commands[run.index : run.index + run.count]
+            assert all(command[:3] == run.command[:3] for command in run_commands)
+            params = {command.nv_param for command in run_commands}
+            assert (run.distinct_params, run.min_param, run.max_param) == (len(params), min(params), max(params))
+            assert run.last_param == run_commands[-1].nv_param
+            expanded.extend(run_commands)
+        assert expanded == commands
+
+
+def test_collapsed_pretty_strings(nv2a):
+    depth_func = nv2a.NV097_SET_DEPTH_FUNC
+    blend = nv2a.NV097_SET_BLEND_ENABLE
+    commands = _commands(
+        nv2a,
+        (0, blend, 1),
+        (0, depth_func, 0x201),
+        (0, depth_func, 0x201),
+        (0, blend, 0),
+        (0, blend, 1),
+        (0, blend, 0),
+    )
+
+    lines = list(nv2a.iter_collapsed_pretty_strings(commands, cache_size=1))
+
+    assert lines == [
+        "nv2a_pgraph_method 0: 0x97 -> NV097_SET_BLEND_ENABLE<0x304> (TRUE <0x1>)",
+        "nv2a_pgraph_method 0: 0x97 -> NV097_SET_DEPTH_FUNC<0x354> (V_LESS <0x201>) x2",
+        "nv2a_pgraph_method 0: 0x97 -> NV097_SET_BLEND_ENABLE<0x304> x3 (2 distinct values in 0x0..0x1; "
+        "first FALSE <0x0>, last FALSE <0x0>)",
+    ]
+
+
+def test_collapsed_pretty_strings_match_uncollapsed_singletons(nv2a):
+    commands = [nv2a.RawCommand(0, 0x97, nv_op, 0x201) for nv_op in range(0x300, 0x380, 4)]
+
+    assert list(nv2a.iter_collapsed_pretty_strings(commands)) == [
+        nv2a.get_command_info(*command).get_pretty_string() for command in commands
+    ]
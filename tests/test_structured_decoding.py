@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from nv2a_define_collator.generate_nv2a_constants import _to_field_name
+
+# Pretty strings rendered by the string-only processors that preceded the structured decoders.
+_EXPECTED_PRETTY_STRINGS = [
+    (
+        "NV097_SET_TEXTURE_FORMAT",
+        0x0001012A,
+        "NV097_SET_TEXTURE_FORMAT[0]<0x1b04> (0x1012A {DMA_B, BORDER_SOURCE_COLOR, SZ_AY8, MipmapLevels:1, 2D, "
+        "BaseSizeU:1, BaseSizeV:1, BaseSizeP:1} <0x1012a>)",
+    ),
+    (
+        "NV097_SET_TEXTURE_FORMAT",
+        0x00010C29,
+        "NV097_SET_TEXTURE_FORMAT[0]<0x1b04> (0x10C29 {DMA_A, BORDER_SOURCE_COLOR, L_DXT1_A1R5G5B5, MipmapLevels:1, "
+        "2D, BaseSizeU:1, BaseSizeV:1, BaseSizeP:1} <0x10c29>)",
+    ),
+    (
+        "NV097_SET_FOG_COLOR",
+        0x80402010,
+        "NV097_SET_FOG_COLOR<0x2a8> ({RED:0x10, GREEN:0x20, BLUE:0x40, ALPHA:0x80} <0x80402010>)",
+    ),
+    ("NV097_SET_MATERIAL_EMISSION", 0x3F800000, "NV097_SET_MATERIAL_EMISSION[0]<0x3a8> (1.0 <0x3f800000>)"),
+    ("NV097_SET_BLEND_ENABLE", 1, "NV097_SET_BLEND_ENABLE<0x304> (TRUE <0x1>)"),
+    ("NV097_SET_DEPTH_FUNC", 0x203, "NV097_SET_DEPTH_FUNC<0x354> (V_LEQUAL <0x203>)"),
+    (
+        "NV097_SET_SURFACE_FORMAT",
+        0x128,
+        "NV097_SET_SURFACE_FORMAT<0x208> (0x128 {LE_A8R8G8B8, Z24S8, Type:Pitch, AA:Center_1, Width:1, Height:1} "
+        "<0x128>)",
+    ),
+    (
+        "NV097_SET_COMBINER_CONTROL",
+        0x00011102,
+        "NV097_SET_COMBINER_CONTROL<0x1e60> (0x11102 {Count:2, Mux:MSB, Factor0:EACH_STAGE, Factor1:EACH_STAGE} "
+        "<0x11102>)",
+    ),
+    (
+        "NV097_SET_COLOR_MATERIAL",
+        0x5,
+        "NV097_SET_COLOR_MATERIAL<0x298> (0x5 {EMISSIVE:VertexDiffuse, AMBIENT:VertexDiffuse, DIFFUSE:Material, "
+        "SPECULAR:Material, BACK_EMISSIVE:Material, BACK_AMBIENT:Material, BACK_DIFFUSE:Material, "
+        "BACK_SPECULAR:Material} <0x5>)",
+    ),
+    (
+        "NV097_SET_TEXTURE_CONTROL0",
+        0x4003FFC0,
+        "NV097_SET_TEXTURE_CONTROL0[0]<0x1b0c> (0x4003FFC0 {MaxAniso:1, MaxLOD:4095, MinLOD:0} <0x4003ffc0>)",
+    ),
+    (
+        "NV097_SET_LIGHT_CONTROL",
+        0x10001,
+        "NV097_SET_LIGHT_CONTROL<0x294> (0x10001 {SeparateSpecular, LocalEye, SOut:ZeroOut} <0x10001>)",
+    ),
+    ("NV097_SET_CULL_FACE", 0x405, "NV097_SET_CULL_FACE<0x39c> (V_BACK <0x405>)"),
+    ("NV097_SET_BEGIN_END", 5, "NV097_SET_BEGIN_END<0x17fc> (OP_TRIANGLES <0x5>)"),
+    (
+        "NV097_SET_VERTEX_DATA_ARRAY_FORMAT",
+        0x22,
+        "NV097_SET_VERTEX_DATA_ARRAY_FORMAT__POS[0]<0x1760> (0x22 {Type:Float, Size:2, Stride:0 (0x0)} <0x22>)",
+    ),
+]
+
+_SAMPLE_PARAMS = [0, 1, 2, 0x0C, 0x201, 0x2401, 0x3F800000, 0x12345678, 0xFFFFFFFF] + [
+    random.Random(1).getrandbits(32) for _ in range(16)
+]
+
+
+@pytest.mark.parametrize(("method", "nv_param", "expected"), _EXPECTED_PRETTY_STRINGS)
+def test_pretty_strings_are_unchanged(nv2a, method, nv_param, expected):
+    info = nv2a.get_command_info(0, 0x97, getattr(nv2a, method), nv_param)
+
+    assert info.get_pretty_string() == f"nv2a_pgraph_method 0: 0x97 -> {expected}"
+
+
+def _render(func, *args) -> str:
+    try:
+        return str(func(*args))
+    except (IndexError, ValueError) as err:
+        # Some processors reject parameters with out of range fields.
+        return repr(err)
+
+
+def test_processors_render_their_decoded_fields(nv2a):
+    for key, processor in nv2a.PROCESSORS.items():
+        decoder = nv2a.DECODERS[key]
+        for nv_param in _SAMPLE_PARAMS:
+            assert _render(processor, *key, nv_param) == _render(decoder, *key, nv_param), (key, nv_param)
+
+
+def test_decoded_fields_are_named(nv2a):
+    fields = nv2a.decode_param(0x97, nv2a.NV097_SET_TEXTURE_FORMAT, 0x0001012A)
+
+    assert fields.nv_param == 0x0001012A
+    assert fields.COLOR == 0x01
+    assert fields.MIPMAP_LEVELS == 1
+    assert type(fields).FIELD_VALUES["COLOR"][fields.COLOR] == "SZ_AY8"
+
+
+@pytest.mark.parametrize(
+    ("short_name", "expected"),
+    [("COLOR", "COLOR"), ("IN", "IN"), ("2D", "F_2D"), ("_HIDDEN", "F__HIDDEN"), ("class", "F_class")],
+)
+def test_field_names_are_valid_identifiers(short_name, expected):
+    assert _to_field_name(short_name) == expected
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def commands(nv2a):
+    rng = random.Random(3)
+    methods = [
+        (0x97, nv2a.NV097_SET_DEPTH_FUNC),
+        (0x97, nv2a.NV097_SET_TEXTURE_FORMAT),
+        (0x62, nv2a.NV062_SET_PITCH),
+        (0x39, 0x300),
+    ]
+    ret = []
+    for _ in range(500):
+        nv_class, nv_op = rng.choice(methods)
+        ret.append(nv2a.RawCommand(rng.randrange(3), nv_class, nv_op, rng.choice([0x201, 0x203, rng.getrandbits(32)])))
+    return ret
+
+
+def test_streams_hold_each_channel_and_class(nv2a, commands):
+    trace = nv2a.DemuxedTrace(commands)
+
+    assert trace.total_commands == len(commands)
+    for key, stream in trace.streams.items():
+        assert stream.commands == [command for command in commands if (command.channel, command.nv_class) == key]
+        assert [commands[index] for index in stream.indices] == stream.commands
+
+
+def test_merge_restores_the_original_order(nv2a, commands):
+    trace = nv2a.DemuxedTrace(commands)
+
+    assert list(trace.merge_commands()) == commands
+
+
+def test_merge_of_filtered_streams_keeps_original_indices(nv2a, commands):
+    trace = nv2a.DemuxedTrace(commands, channels=[0, 2], classes=[0x97])
+    expected = [
+        (index, command)
+        for index, command in enumerate(commands)
+        if command.channel in (0, 2) and command.nv_class == 0x97
+    ]
+
+    assert trace.total_commands == len(commands)
+    assert list(trace.merge({key: stream.commands for key, stream in trace.streams.items()})) == expected
+
+
+def test_merge_skips_missing_streams(nv2a, commands):
+    trace = nv2a.DemuxedTrace(commands)
+    key = nv2a.StreamKey(1, 0x62)
+
+    merged = list(trace.merge({key: trace.streams[key].commands}))
+
+    assert [command for _, command in merged] == [
+        command for command in commands if (command.channel, command.nv_class) == key
+    ]
+
+
+def test_decode_merged_matches_sequential_decoding(nv2a, commands):
+    trace = nv2a.DemuxedTrace(commands)
+    expected = [nv2a.DecodedCommand(command, nv2a.decode_param(*command[1:])) for command in commands]
+
+    assert list(trace.decode_merged()) == expected
+    with nv2a.ParallelDecoder(max_workers=2, chunk_size=16) as decoder:
+        assert list(trace.decode_merged(decoder)) == expected
+
+
+def test_from_raw(nv2a, commands):
+    buffer = b"".join(nv2a.RAW_COMMAND_RECORD.pack(*command) for command in commands)
+
+    assert list(nv2a.DemuxedTrace.from_raw(buffer).merge_commands()) == commands
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+
+import pytest
+
+from nv2a_define_collator.generate_nv2a_constants import PGRAPHCommand, _build_class_names
+
+
+def _reject_constant(constant: str):
+    msg = f"Non-standard JSON constant {constant}"
+    raise ValueError(msg)
+
+
+@pytest.fixture
+def commands(nv2a):
+    return [
+        nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_TEXTURE_FORMAT, 0x0001012A),
+        nv2a.RawCommand(1, 0x97, nv2a.NV097_SET_DEPTH_FUNC, 0x203),
+        nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_MATERIAL_EMISSION, 0x3F800000),
+        nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_MATERIAL_EMISSION, 0x7FC00000),
+        nv2a.RawCommand(0, 0x97, nv2a.NV097_SET_MATERIAL_EMISSION, 0xFF800000),
+        nv2a.RawCommand(2, 0x62, nv2a.NV062_SET_PITCH, 0x01000100),
+        nv2a.RawCommand(0, 0x97, 0x1FFC, 0x12345678),
+        nv2a.RawCommand(0, 0x42, 0x300, 7),
+    ]
+
+
+def _expected_fields(nv2a, command):
+    fields = nv2a.decode_param(command.nv_class, command.nv_op, command.nv_param)
+    if fields is None:
+        return None
+    ret = {}
+    for name, value in zip(fields._fields[1:], fields[1:]):
+        ret[name] = str(value) if isinstance(value, float) and not math.isfinite(value) else value
+    if isinstance(fields, nv2a.EnumParam):
+        ret["value_name"] = fields.value_name
+    return ret
+
+
+def test_ndjson_round_trip(nv2a, commands):
+    stream = io.BytesIO()
+
+    assert nv2a.write_ndjson(commands, stream, batch_bytes=64) == len(commands)
+
+    records = [json.loads(line, parse_constant=_reject_constant) for line in stream.getvalue().decode().splitlines()]
+    assert len(records) == len(commands)
+    for record, command in zip(records, commands):
+        assert (record["channel"], record["nv_class"], record["nv_op"], record["nv_param"]) == command
+        assert record["class_name"] == nv2a.CLASS_NAMES.get(command.nv_class, "")
+        assert record["op_name"] == nv2a._NAME_MAP.get((command.nv_class, command.nv_op), "")
+        assert record["fields"] == _expected_fields(nv2a, command)
+
+
+def test_ndjson_writes_non_finite_floats_as_strings(nv2a, commands):
+    stream = io.BytesIO()
+    nv2a.write_ndjson(commands, stream)
+
+    records = [json.loads(line) for line in stream.getvalue().decode().splitlines()]
+    assert [record["fields"]["value"] for record in records[2:5]] == [1.0, "nan", "-inf"]
+    assert records[0]["fields"]["COLOR"] == 0x01
+    assert records[6]["fields"] is None
+
+
+def test_columnar_round_trip(nv2a, commands):
+    stream = io.BytesIO()
+
+    assert nv2a.write_columnar(commands, stream, batch_size=3) == len(commands)
+
+    rows = []
+    for chunk in nv2a.iter_columnar_chunks(stream.getvalue()):
+        rows.extend(zip(*(chunk[name] for name in nv2a.TRACE_COLUMNS)))
+
+    assert len(rows) == len(commands)
+    for row, command in zip(rows, commands):
+        record = dict(zip(nv2a.TRACE_COLUMNS, row))
+        assert (record["channel"], record["nv_class"], record["nv_op"], record["nv_param"]) == command
+        assert record["class_name"] == nv2a.CLASS_NAMES.get(command.nv_class, "")
+        expected_fields = _expected_fields(nv2a, command)
+        assert (json.loads(record["fields"]) if record["fields"] else None) == expected_fields
+
+
+def test_columnar_rejects_other_files(nv2a):
+    with pytest.raises(ValueError, match="Not an nv2a columnar trace"):
+        list(nv2a.iter_columnar_chunks(b"PAR1" + bytes(16)))
+
+
+def test_parquet_round_trip(nv2a, commands, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "trace.parquet"
+
+    assert nv2a.export_columnar(commands, str(path)) == "parquet"
+
+    table = parquet.read_table(path)
+    assert table.column_names == list(nv2a.TRACE_COLUMNS)
+    assert list(zip(*(table.column(name).to_pylist() for name in ("channel", "nv_class", "nv_op", "nv_param")))) == [
+        tuple(command) for command in commands
+    ]
+
+
+def test_class_names_cover_every_class_in_the_headers():
+    tree = {name: (PGRAPHCommand(name, "0x100", 0x100), {}) for name in ("NV097_NO_OPERATION", "NV0AB_NO_OPERATION")}
+
+    class_names = _build_class_names(tree)
+
+    assert '0x97: "NV20_KELVIN_PRIMITIVE"' in class_names
+    assert '0xAB: "NV0AB"' in class_names
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+_TEXTURE_FORMAT_NAMES = {f"NV097_SET_TEXTURE_FORMAT[{stage}]" for stage in range(4)}
+
+
+@pytest.fixture(scope="module")
+def commands(nv2a):
+    """A random mix of texture format, depth function and NV062 writes on several channels."""
+    rng = random.Random(0)
+    methods = [(0x97, nv2a.NV097_SET_TEXTURE_FORMAT + stage * 0x40) for stage in range(4)] + [
+        (0x97, nv2a.NV097_SET_DEPTH_FUNC),
+        (0x97, nv2a.NV097_SET_BLEND_ENABLE),
+        (0x62, nv2a.NV062_SET_PITCH),
+    ]
+    ret = []
+    for _ in range(4000):
+        nv_class, nv_op = rng.choice(methods)
+        nv_param = rng.choice(
+            [
+                rng.getrandbits(32),
+                rng.choice([0x06, 0x07, 0x0C, 0x12]) << 8 | rng.getrandbits(8),
+                0x12,
+                0x1200,
+                0x1212,
+                0x201,
+                0x203,
+            ]
+        )
+        ret.append(nv2a.RawCommand(rng.randrange(3), nv_class, nv_op, nv_param))
+    return ret
+
+
+def _texture_color_name(nv2a, command) -> str | None:
+    fields = nv2a.decode_param(command.nv_class, command.nv_op, command.nv_param)
+    return type(fields).FIELD_VALUES["COLOR"].get(fields.COLOR)
+
+
+def _is_texture_format(nv2a, command) -> bool:
+    return nv2a._NAME_MAP.get((command.nv_class, command.nv_op)) in _TEXTURE_FORMAT_NAMES
+
+
+_QUERIES = [
+    (
+        {"names": ["SET_TEXTURE_FORMAT"], "fields": {"COLOR": ["SZ_A8R8G8B8", "SZ_X8R8G8B8"]}},
+        lambda nv2a, command: (
+            _is_texture_format(nv2a, command) and _texture_color_name(nv2a, command) in {"SZ_A8R8G8B8", "SZ_X8R8G8B8"}
+        ),
+    ),
+    (
+        {"names": ["NV097_SET_TEXTURE_FORMAT[2]"], "fields": {"COLOR": "*DXT1*"}},
+        lambda nv2a, command: (
+            nv2a._NAME_MAP.get((command.nv_class, command.nv_op)) == "NV097_SET_TEXTURE_FORMAT[2]"
+            and _texture_color_name(nv2a, command) == "L_DXT1_A1R5G5B5"
+        ),
+    ),
+    (
+        {"names": ["SET_TEXTURE_FORMAT"], "fields": {"COLOR": range(6, 8), "CONTEXT_DMA": 1}},
+        lambda nv2a, command: (
+            _is_texture_format(nv2a, command) and (command.nv_param >> 8) & 0xFF in (6, 7) and command.nv_param & 3 == 1
+        ),
+    ),
+    # Overlapping predicates that disagree can never match.
+    (
+        {"names": ["SET_TEXTURE_FORMAT"], "fields": {"nv_param": 0x12, "COLOR": 0x12}},
+        lambda nv2a, command: (
+            _is_texture_format(nv2a, command) and command.nv_param == 0x12 and (command.nv_param >> 8) & 0xFF == 0x12
+        ),
+    ),
+    # Overlapping predicates that agree behave as one.
+    (
+        {"names": ["SET_TEXTURE_FORMAT"], "fields": {"nv_param": 0x1200, "COLOR": 0x12}},
+        lambda nv2a, command: _is_texture_format(nv2a, command) and command.nv_param == 0x1200,
+    ),
+    (
+        {"names": ["*DEPTH_FUNC"], "fields": {"value": "V_LEQUAL"}, "channels": [1, 2]},
+        lambda nv2a, command: (
+            command.nv_op == nv2a.NV097_SET_DEPTH_FUNC
+            and command.nv_class == 0x97
+            and command.nv_param == 0x203
+            and command.channel in (1, 2)
+        ),
+    ),
+    (
+        {"classes": [0x62], "channels": [0]},
+        lambda _nv2a, command: command.nv_class == 0x62 and command.channel == 0,
+    ),
+    (
+        {"ops": range(0x300, 0x400)},
+        lambda _nv2a, command: 0x300 <= command.nv_op < 0x400,
+    ),
+]
+
+
+@pytest.mark.parametrize(("query_args", "predicate"), _QUERIES)
+def test_query_matches_brute_force_filter(nv2a, commands, query_args, predicate):
+    query = nv2a.TraceQuery(**query_args)
+    expected = [command for command in commands if predicate(nv2a, command)]
+
+    assert list(query.filter(commands)) == expected
+    assert [command for command in commands if query.matches(command)] == expected
+
+
+def test_overlapping_checks_are_not_merged(nv2a):
+    query = nv2a.TraceQuery(names=["SET_TEXTURE_FORMAT"], fields={"nv_param": 0x12, "COLOR": 0x12})
+
+    for checks in query.checks.values():
+        assert len(checks) == 2
+
+
+def test_raw_trace_filtering(nv2a, commands):
+    buffer = b"".join(nv2a.RAW_COMMAND_RECORD.pack(*command) for command in commands)
+    query = nv2a.TraceQuery(names=["SET_TEXTURE_FORMAT"], fields={"COLOR": "SZ_A8R8G8B8"})
+
+    assert list(query.filter_raw(buffer)) == list(query.filter(commands))
+
+
+def test_unknown_field_is_rejected(nv2a):
+    with pytest.raises(ValueError, match="No method matching the query"):
+        nv2a.TraceQuery(names=["SET_DEPTH_FUNC"], fields={"COLOR": 1})